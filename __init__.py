@@ -12,7 +12,10 @@ from .data_model import (
     RobotScene,
     Transform,
     TransformOnFrame,
+    SceneBatch,
+    quaternions_to_matrices,
     # RobotFrame系统
+    JsonlFrameSpill,
     ObjectAction,
     RobotFrame,
     RobotFrameSequence,
@@ -20,11 +23,18 @@ from .data_model import (
     Trajectory,
     # DataBag系统
     DataBag,
+    SceneCache,
+    SceneStore,
+    get_scene_cache,
+    scene_hash,
     # 类型别名
     tensor1f,
     tensor2f,
     tensor3f,
     tensor4f,
+    # 张量编解码
+    TensorEncoder,
+    tensor_fields,
 )
 
 __all__ = [
@@ -44,12 +54,22 @@ __all__ = [
     "RobotInfo",
     "ObjectInfo",
     "RobotScene",
+    "SceneBatch",
+    "quaternions_to_matrices",
     # RobotFrame系统
     "RobotState",
     "Trajectory",
     "ObjectAction",
     "RobotFrame",
     "RobotFrameSequence",
+    "JsonlFrameSpill",
     # DataBag系统
     "DataBag",
+    "SceneCache",
+    "SceneStore",
+    "get_scene_cache",
+    "scene_hash",
+    # 张量编解码
+    "TensorEncoder",
+    "tensor_fields",
 ]
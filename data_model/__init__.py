@@ -12,9 +12,11 @@ from .scene import (
     Transform,
     TransformOnFrame,
 )
+from .scene_batch import SceneBatch, quaternions_to_matrices
 
 # RobotFrame系统
 from .frame import (
+    JsonlFrameSpill,
     ObjectAction,
     RobotFrame,
     RobotFrameSequence,
@@ -24,10 +26,14 @@ from .frame import (
 
 # DataBag系统
 from .databag import DataBag
+from .scene_store import SceneCache, SceneStore, get_scene_cache, scene_hash
 
 # 类型别名
 from .types import tensor1f, tensor2f, tensor3f, tensor4f
 
+# 张量编解码
+from .tensor_codec import TensorEncoder, tensor_fields
+
 __all__ = [
     # 类型别名
     "tensor1f",
@@ -45,12 +51,22 @@ __all__ = [
     "RobotInfo",
     "ObjectInfo",
     "RobotScene",
+    "SceneBatch",
+    "quaternions_to_matrices",
     # RobotFrame系统
     "RobotState",
     "Trajectory",
     "ObjectAction",
     "RobotFrame",
     "RobotFrameSequence",
+    "JsonlFrameSpill",
     # DataBag系统
     "DataBag",
+    "SceneCache",
+    "SceneStore",
+    "get_scene_cache",
+    "scene_hash",
+    # 张量编解码
+    "TensorEncoder",
+    "tensor_fields",
 ]
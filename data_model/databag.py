@@ -43,6 +43,9 @@ class DataBag(BaseModel):
     def get_frames(self) -> list[RobotFrame]:
         """获取所有帧"""
         if self.frames:
+            if self.frames.capacity is not None:
+                # 环形缓冲模式下帧存储为 deque，返回按时间顺序的列表副本
+                return list(self.frames.frames)
             return self.frames.frames
         return []
 
@@ -1,6 +1,12 @@
 """RobotFrame系统"""
 
-from pydantic import BaseModel
+import json
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+from itertools import pairwise
+from pathlib import Path
+from pydantic import BaseModel, PrivateAttr
 from typing import Any, Literal
 
 from .types import tensor1f, tensor2f
@@ -67,15 +73,82 @@ class RobotFrame(BaseModel):
     scene_id: str = ""  # 关联的场景ID
 
 
+class JsonlFrameSpill:
+    """将被淘汰的帧追加写入JSONL文件，可通过 RobotFrameSequence.set_spill 设置"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def __call__(self, frame: RobotFrame):
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(frame.model_dump_json())
+            f.write("\n")
+
+    def load(self) -> list[RobotFrame]:
+        """读取已写入的所有帧"""
+        if not self.path.exists():
+            return []
+        with self.path.open(encoding="utf-8") as f:
+            return [RobotFrame.model_validate(json.loads(line)) for line in f if line.strip()]
+
+
 class RobotFrameSequence(BaseModel):
-    """RobotFrame序列，用于存储一系列帧"""
+    """RobotFrame序列，用于存储一系列帧
+
+    capacity 为 None 时帧列表无限增长；设置 capacity 后为环形缓冲模式，
+    只保留最近 capacity 帧，追加和淘汰均为 O(1)，被淘汰的帧交给 set_spill 设置的回调（可选）。
+
+    环形缓冲模式下 frames 为 deque：不支持切片（需要时用 list(frames)），
+    且只能通过 add_frame 添加帧，直接修改 frames 会绕过淘汰和落盘回调。
+    seq 必须严格递增（自动分配的 seq 总是满足），否则抛出 ValueError。
+    """
 
     sequence_id: str = ""  # 序列ID
     scene_id: str = ""  # 关联的场景ID
-    frames: list[RobotFrame] = []  # 帧列表
+    frames: list[RobotFrame] | deque[RobotFrame] = []  # 帧列表（环形缓冲模式下为 deque）
+    capacity: int | None = None  # 最大帧数（None 表示不限制）
+
+    _spill: Callable[[RobotFrame], None] | None = PrivateAttr(default=None)  # 淘汰帧回调
+
+    def model_post_init(self, __context: Any):
+        if self.capacity is None:
+            return
+        if self.capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {self.capacity}")
+        # 只保留最近 capacity 帧
+        self.frames = deque(self.frames, maxlen=None)
+        for prev, frame in pairwise(self.frames):
+            if frame.seq <= prev.seq:
+                raise ValueError(
+                    f"Frame seq must be strictly increasing in ring mode, "
+                    f"got {frame.seq} after {prev.seq}"
+                )
+        while len(self.frames) > self.capacity:
+            self.frames.popleft()
+
+    def set_spill(self, spill: Callable[[RobotFrame], None] | None):
+        """设置环形缓冲模式下被淘汰帧的回调（如 JsonlFrameSpill），None 表示直接丢弃"""
+        self._spill = spill
 
     def add_frame(self, frame: RobotFrame):
         """添加帧到序列"""
+        if self.capacity is not None:
+            # 环形缓冲模式：按最新帧的seq递增分配，回绕或重新加载后seq仍然唯一且有序
+            if frame.seq == 0 and self.frames:
+                frame.seq = self.frames[-1].seq + 1
+            elif self.frames and frame.seq <= self.frames[-1].seq:
+                # get_frame_by_seq 依赖 seq 有序
+                raise ValueError(
+                    f"Frame seq must be strictly increasing in ring mode, "
+                    f"got {frame.seq} after {self.frames[-1].seq}"
+                )
+            while len(self.frames) >= self.capacity:
+                evicted = self.frames.popleft()
+                if self._spill is not None:
+                    self._spill(evicted)
+            self.frames.append(frame)
+            return
+
         # 自动设置seq（如果未设置）
         if frame.seq == 0 and len(self.frames) > 0:
             # 如果seq为0且已有帧，自动分配下一个序列号
@@ -84,6 +157,15 @@ class RobotFrameSequence(BaseModel):
 
     def get_frame_by_seq(self, seq: int) -> RobotFrame | None:
         """根据序列号获取帧"""
+        if self.capacity is not None and self.frames:
+            # seq 连续时按相对最旧帧的偏移直接定位，否则按 seq 有序二分查找
+            offset = seq - self.frames[0].seq
+            if 0 <= offset < len(self.frames) and self.frames[offset].seq == seq:
+                return self.frames[offset]
+            i = bisect_left(self.frames, seq, key=lambda f: f.seq)
+            if i < len(self.frames) and self.frames[i].seq == seq:
+                return self.frames[i]
+            return None
         for frame in self.frames:
             if frame.seq == seq:
                 return frame
@@ -92,3 +174,16 @@ class RobotFrameSequence(BaseModel):
     def get_frames_by_robot(self, robot_id: str) -> list[RobotFrame]:
         """获取包含指定机器人的所有帧"""
         return [f for f in self.frames if robot_id in f.robot_states]
+
+    def get_frames_since(self, timestamp: float) -> list[RobotFrame]:
+        """获取时间戳不早于 timestamp 的所有帧（假定帧按时间顺序添加），按时间顺序返回
+
+        从最新帧向前扫描，代价只与返回的帧数有关，适用于"最近N秒"查询。
+        """
+        result = []
+        for frame in reversed(self.frames):
+            if frame.timestamp < timestamp:
+                break
+            result.append(frame)
+        result.reverse()
+        return result
@@ -0,0 +1,198 @@
+"""场景批量求值：对同一模板场景的大量候选布局一次性计算世界位姿"""
+
+import numpy as np
+
+from .scene import RobotScene, Transform
+
+
+def quaternions_to_matrices(poses: np.ndarray) -> np.ndarray:
+    """将 (..., 7) 位姿数组 [x, y, z, qx, qy, qz, qw] 转换为 (..., 4, 4) 齐次变换矩阵
+
+    四元数采用 RWT 格式 [x, y, z, w]，与 Transform.to_matrix 行为一致：
+    先归一化，模长过小时退化为单位旋转。
+    """
+    poses = np.asarray(poses, dtype=np.float64)
+    if poses.shape[-1] != 7:
+        raise ValueError(f"Pose array last dimension must be 7, got shape {poses.shape}")
+
+    quat = poses[..., 3:7]
+    norm = np.linalg.norm(quat, axis=-1, keepdims=True)
+    valid = norm > 1e-6
+    quat = np.where(valid, quat / np.where(valid, norm, 1.0), [0.0, 0.0, 0.0, 1.0])
+    x, y, z, w = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+
+    matrix = np.zeros(poses.shape[:-1] + (4, 4))
+    matrix[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    matrix[..., 0, 1] = 2 * (x * y - w * z)
+    matrix[..., 0, 2] = 2 * (x * z + w * y)
+    matrix[..., 1, 0] = 2 * (x * y + w * z)
+    matrix[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    matrix[..., 1, 2] = 2 * (y * z - w * x)
+    matrix[..., 2, 0] = 2 * (x * z - w * y)
+    matrix[..., 2, 1] = 2 * (y * z + w * x)
+    matrix[..., 2, 2] = 1 - 2 * (x * x + y * y)
+    matrix[..., :3, 3] = poses[..., :3]
+    matrix[..., 3, 3] = 1.0
+    return matrix
+
+
+def _transform_to_pose(transform: Transform) -> list[float]:
+    """将 Transform 展平为 [x, y, z, qx, qy, qz, qw]，非法字段按 to_matrix 的规则回退"""
+    translation = list(transform.translation)
+    if len(translation) != 3:
+        translation = [0.0, 0.0, 0.0]
+    return translation + transform.to_quaternion()
+
+
+class SceneBatch:
+    """场景批量求值器
+
+    以一个模板 RobotScene 为基础，预先解析坐标系树（物件及其子坐标系），
+    之后对 (S, K, 7) 的候选位姿覆盖数组一次性计算所有候选场景中
+    每个坐标系的世界位姿，结果为 (S, N, 4, 4) 数组。
+
+    坐标系命名规则与场景中 frame_id 的写法一致：
+    - 物件本身："robot_1"
+    - 物件子坐标系："robot_1/tool0"
+    """
+
+    def __init__(self, scene: RobotScene, override_names: list[str] | None = None):
+        """
+        Args:
+            scene: 模板场景
+            override_names: 可被覆盖位姿的物件名称（决定 K 维的顺序），
+                默认为全部机器人（按插入顺序）后接全部物件
+        """
+        self.world_frame = scene.world_frame
+
+        # 收集所有坐标系：(名称, 父坐标系引用, 局部位姿)
+        entries: list[tuple[str, str, list[float]]] = []
+        object_names: list[str] = []
+        for obj in [*scene.robots.values(), *scene.objects.values()]:
+            if obj.name in object_names:
+                raise ValueError(f"Duplicate object name '{obj.name}' in scene")
+            object_names.append(obj.name)
+            entries.append((obj.name, obj.pose.frame_id, _transform_to_pose(obj.pose.transform)))
+            for frame_name, frame in obj.frames.items():
+                entries.append(
+                    (
+                        f"{obj.name}/{frame_name}",
+                        frame.frame_id,
+                        _transform_to_pose(frame.transform),
+                    )
+                )
+
+        self.frame_names: list[str] = [name for name, _, _ in entries]
+        self._index = index = {}
+        for i, name in enumerate(self.frame_names):
+            if name in index:
+                # 如物件名 "robot_1/tool0" 与 robot_1 的子坐标系 tool0 冲突
+                raise ValueError(f"Duplicate frame name '{name}' in scene")
+            index[name] = i
+
+        # 解析父坐标系索引（-1 表示世界坐标系）
+        parents = np.full(len(entries), -1, dtype=np.int64)
+        for i, (name, parent_ref, _) in enumerate(entries):
+            if parent_ref in ("", self.world_frame):
+                continue
+            if parent_ref not in index:
+                raise ValueError(f"Frame '{name}' refers to unknown frame '{parent_ref}'")
+            parents[i] = index[parent_ref]
+        self.parents = parents
+
+        # 按深度分层，同一层内的坐标系可以一次性批量计算
+        depths = np.full(len(entries), -1, dtype=np.int64)
+        for i in range(len(entries)):
+            chain = []
+            j = i
+            while j != -1 and depths[j] == -1:
+                if j in chain:
+                    cycle = " -> ".join(self.frame_names[k] for k in chain)
+                    raise ValueError(f"Cyclic frame reference: {cycle}")
+                chain.append(j)
+                j = parents[j]
+            depth = -1 if j == -1 else depths[j]
+            for k in reversed(chain):
+                depth += 1
+                depths[k] = depth
+        self.levels: list[np.ndarray] = [
+            np.flatnonzero(depths == d) for d in range(int(depths.max(initial=-1)) + 1)
+        ]
+
+        # 模板局部变换
+        self.local_poses = np.array([pose for _, _, pose in entries], dtype=np.float64).reshape(
+            -1, 7
+        )
+        self.local_matrices = quaternions_to_matrices(self.local_poses)
+
+        # 可覆盖位姿的物件
+        if override_names is None:
+            override_names = object_names
+        for name in override_names:
+            if name not in object_names:
+                raise ValueError(f"Unknown object '{name}' in override_names")
+        self.override_names = list(override_names)
+        self.override_indices = np.array(
+            [index[name] for name in self.override_names], dtype=np.int64
+        )
+
+    @property
+    def num_frames(self) -> int:
+        """坐标系数量 N"""
+        return len(self.frame_names)
+
+    @property
+    def num_overrides(self) -> int:
+        """可覆盖物件数量 K"""
+        return len(self.override_names)
+
+    def template_poses(self) -> np.ndarray:
+        """返回模板场景中可覆盖物件的位姿，形状 (K, 7)，可作为构造候选数组的起点"""
+        return self.local_poses[self.override_indices].copy()
+
+    def evaluate(self, poses: np.ndarray) -> np.ndarray:
+        """计算所有候选场景中每个坐标系的世界位姿
+
+        Args:
+            poses: (S, K, 7) 候选位姿覆盖 [x, y, z, qx, qy, qz, qw]，
+                每个位姿相对于对应物件在模板中的 frame_id
+
+        Returns:
+            (S, N, 4, 4) 世界位姿，N 的顺序与 frame_names 一致
+        """
+        poses = np.asarray(poses, dtype=np.float64)
+        if poses.ndim != 3 or poses.shape[1:] != (self.num_overrides, 7):
+            raise ValueError(
+                f"Expected poses of shape (S, {self.num_overrides}, 7), got {poses.shape}"
+            )
+        num_scenes = poses.shape[0]
+
+        local = np.broadcast_to(self.local_matrices, (num_scenes, self.num_frames, 4, 4)).copy()
+        local[:, self.override_indices] = quaternions_to_matrices(poses)
+
+        world = np.empty_like(local)
+        for level in self.levels:
+            parents = self.parents[level]
+            is_root = parents == -1
+            roots, children = level[is_root], level[~is_root]
+            world[:, roots] = local[:, roots]
+            if len(children):
+                world[:, children] = world[:, parents[~is_root]] @ local[:, children]
+        return world
+
+    def get_transform(self, world: np.ndarray, from_frame: str, to_frame: str) -> np.ndarray:
+        """从 evaluate 结果中查询 from_frame 到 to_frame 的变换，形状 (S, 4, 4)
+
+        返回矩阵将 from_frame 坐标系下的点变换到 to_frame 坐标系下。
+        """
+        from_world = self._world_of(world, from_frame)
+        to_world = self._world_of(world, to_frame)
+        return np.linalg.inv(to_world) @ from_world
+
+    def _world_of(self, world: np.ndarray, frame: str) -> np.ndarray:
+        """获取某个坐标系的 (S, 4, 4) 世界位姿"""
+        if frame in ("", self.world_frame):
+            return np.broadcast_to(np.eye(4), (world.shape[0], 4, 4))
+        if frame not in self._index:
+            raise ValueError(f"Unknown frame '{frame}'")
+        return world[:, self._index[frame]]
@@ -0,0 +1,265 @@
+"""场景存储：按内容哈希去重存储 RobotScene，DataBag 通过哈希引用场景"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .databag import DataBag
+from .scene import RobotScene
+
+
+def canonical_scene_json(scene: RobotScene | dict[str, Any]) -> bytes:
+    """生成场景的规范化JSON（键排序、无多余空白），相同内容总是得到相同字节"""
+    if isinstance(scene, RobotScene):
+        data = scene.model_dump(mode="json")
+    else:
+        data = RobotScene.model_validate(scene).model_dump(mode="json")
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def scene_hash(scene: RobotScene | dict[str, Any]) -> str:
+    """计算场景的内容哈希（规范化JSON的SHA-256）"""
+    return hashlib.sha256(canonical_scene_json(scene)).hexdigest()
+
+
+# 校验后的 RobotScene 对象图占用内存与规范化JSON字节数之比（以位姿数据为主的场景实测约 12 倍）
+SCENE_MEMORY_FACTOR = 12
+
+
+def estimate_scene_bytes(blob: bytes) -> int:
+    """根据规范化JSON估算校验后场景对象的内存占用（字节）"""
+    return len(blob) * SCENE_MEMORY_FACTOR
+
+
+class SceneCache:
+    """已校验 RobotScene 对象的 LRU 缓存，按估算的对象内存占用限制容量
+
+    缓存中的场景实例直接共享给所有调用方，应视为只读，详见 SceneStore.get。
+
+    Args:
+        max_bytes: 缓存对象的内存上限（字节），条目大小由 estimate_scene_bytes 估算
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[RobotScene, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """当前缓存对象占用的内存字节数（估算）"""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> RobotScene | None:
+        """获取缓存的场景，命中时刷新其最近使用顺序"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, scene: RobotScene, nbytes: int):
+        """放入场景，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (scene, nbytes)
+            self._size += nbytes
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# 进程级默认缓存
+_default_cache = SceneCache()
+
+
+def get_scene_cache() -> SceneCache:
+    """获取进程级默认场景缓存"""
+    return _default_cache
+
+
+class SceneStore:
+    """内容寻址的场景存储
+
+    场景以规范化JSON的SHA-256为键只存储一份；指定 root 时存储到
+    `<root>/<hash>.json`，并在 `<root>/<hash>.meta` 中记录 scene_id 和 updated_at，
+    否则保存在内存中。读取时优先命中 SceneCache，同一场景在进程内只解析和校验一次。
+    """
+
+    def __init__(self, root: str | Path | None = None, cache: SceneCache | None = None):
+        self.root = Path(root) if root is not None else None
+        self.cache = cache if cache is not None else get_scene_cache()
+        self._blobs: dict[str, bytes] = {}
+        # {scene_id: (updated_at, hash)}，记录每个场景ID的最新版本
+        self._latest: dict[str, tuple[str, str]] = {}
+
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # 通过元数据文件重建版本索引，无需解析场景本身
+            for path in self.root.glob("*.json"):
+                meta_path = self._meta_path(path.stem)
+                if meta_path.exists():
+                    meta = json.loads(meta_path.read_bytes())
+                else:
+                    # 缺少元数据（如写入中途退出）时解析一次场景并补写
+                    data = json.loads(path.read_bytes())
+                    meta = {
+                        "scene_id": data.get("scene_id", ""),
+                        "updated_at": data.get("updated_at", ""),
+                    }
+                    self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+                self._update_latest(meta["scene_id"], meta["updated_at"], path.stem)
+
+    def _update_latest(self, scene_id: str, updated_at: str, key: str):
+        """更新场景ID的最新版本索引（updated_at 按字符串比较，ISO 8601 格式下即时间顺序）"""
+        current = self._latest.get(scene_id)
+        if current is None or (updated_at, key) > current:
+            self._latest[scene_id] = (updated_at, key)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.meta"
+
+    def _write_atomic(self, path: Path, data: bytes):
+        """先写入同目录临时文件再替换，避免中断或并发写入留下不完整的文件"""
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def __contains__(self, key: str) -> bool:
+        if self.root is not None:
+            return self._path(key).exists()
+        return key in self._blobs
+
+    def put(self, scene: RobotScene) -> str:
+        """存储场景并返回其内容哈希，已存在时不重复写入"""
+        blob = canonical_scene_json(scene)
+        key = hashlib.sha256(blob).hexdigest()
+        if key not in self:
+            if self.root is not None:
+                meta = {"scene_id": scene.scene_id, "updated_at": scene.updated_at}
+                self._write_atomic(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+                self._write_atomic(self._path(key), blob)
+            else:
+                self._blobs[key] = blob
+        self._update_latest(scene.scene_id, scene.updated_at, key)
+        if key not in self.cache:
+            # 从规范化JSON重新构建实例再缓存，避免调用方后续修改场景导致内容与哈希不一致
+            # （校验JSON比深拷贝对象更快）
+            self.cache.put(key, RobotScene.model_validate_json(blob), estimate_scene_bytes(blob))
+        return key
+
+    def get(self, key: str, scene_id: str | None = None) -> RobotScene:
+        """根据内容哈希获取场景
+
+        返回的是缓存中共享的场景实例，同一哈希的所有调用方（包括 load_bag 得到的数据包）
+        拿到的是同一个对象，必须视为只读；需要修改时先 scene.model_copy(deep=True)。
+
+        Args:
+            key: 场景内容哈希
+            scene_id: 期望的场景ID，提供时校验与存储的场景一致
+        """
+        scene = self.cache.get(key)
+        if scene is None:
+            if self.root is not None:
+                if not self._path(key).exists():
+                    raise KeyError(f"Scene '{key}' not found in store")
+                blob = self._path(key).read_bytes()
+            else:
+                if key not in self._blobs:
+                    raise KeyError(f"Scene '{key}' not found in store")
+                blob = self._blobs[key]
+            scene = RobotScene.model_validate_json(blob)
+            self.cache.put(key, scene, estimate_scene_bytes(blob))
+
+        if scene_id is not None and scene.scene_id != scene_id:
+            raise ValueError(
+                f"Scene '{key}' has scene_id '{scene.scene_id}', expected '{scene_id}'"
+            )
+        return scene
+
+    def latest(self, scene_id: str) -> str | None:
+        """获取某个场景ID最新版本（updated_at 最大）的内容哈希"""
+        entry = self._latest.get(scene_id)
+        return entry[1] if entry else None
+
+    def dump_bag(self, bag: DataBag) -> dict[str, Any]:
+        """将数据包转换为引用形式：场景存入存储，数据包中只保留 scene_ref"""
+        key = self.put(bag.scene)
+        data = bag.model_dump(mode="json", exclude={"scene"})
+        data["scene_ref"] = {
+            "hash": key,
+            "scene_id": bag.scene.scene_id,
+            "updated_at": bag.scene.updated_at,
+        }
+        return data
+
+    def dump_bag_json(self, bag: DataBag) -> str:
+        """将数据包转换为引用形式的JSON字符串"""
+        return json.dumps(self.dump_bag(bag), ensure_ascii=False)
+
+    def load_bag(self, data: dict[str, Any] | str | bytes, use_latest: bool = False) -> DataBag:
+        """从引用形式加载数据包，场景从缓存/存储中解析，不重复校验
+
+        数据包的 scene 为缓存中共享的只读实例（见 get），修改前需先拷贝。
+
+        Args:
+            data: dump_bag 的结果或其JSON；也兼容内嵌完整 scene 的数据包
+            use_latest: 为 True 时使用同一 scene_id 的最新版本，而不是引用的哈希版本
+        """
+        if isinstance(data, (str, bytes)):
+            data = json.loads(data)
+        else:
+            data = dict(data)
+
+        ref = data.pop("scene_ref", None)
+        if ref is None:
+            return DataBag.model_validate(data)
+
+        key = ref["hash"]
+        scene_id = ref.get("scene_id", "")
+        if use_latest:
+            key = self.latest(scene_id) or key
+        scene = self.get(key, scene_id=scene_id)
+
+        frames = data.get("frames")
+        if frames and frames.get("scene_id") and frames["scene_id"] != scene.scene_id:
+            raise ValueError(
+                f"Frames scene_id '{frames['scene_id']}' does not match scene scene_id '{scene.scene_id}'"
+            )
+
+        # 传入已校验的共享 RobotScene 实例，pydantic 不会重新校验
+        data["scene"] = scene
+        return DataBag.model_validate(data)
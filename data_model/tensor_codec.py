@@ -0,0 +1,442 @@
+"""张量字段感知的JSON编解码：按字段配置精度批量写出张量，解析时直接构建数组"""
+
+import types
+from collections import deque
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any, Union, get_args, get_origin
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, PydanticUserError, TypeAdapter
+from pydantic_core import from_json, to_json
+
+from .types import tensor1f, tensor2f, tensor3f, tensor4f
+
+# 张量类型别名 -> 维数
+TENSOR_TYPES: dict[Any, int] = {tensor1f: 1, tensor2f: 2, tensor3f: 3, tensor4f: 4}
+
+# 量化步长：单一步长，或齐次变换矩阵的 (平移步长, 旋转步长)
+Step = float | tuple[float, float]
+
+# 模型类 -> 张量字段缓存
+_tensor_fields_cache: dict[type[BaseModel], dict[str, int]] = {}
+
+
+def tensor_fields(model_cls: type[BaseModel]) -> dict[str, int]:
+    """获取模型中声明为张量类型别名的字段 {field_name: ndim}（按类缓存）
+
+    类型别名与其展开形式等价，因此 list[float]、list[tensor2f] 等字段同样会被识别。
+    """
+    cached = _tensor_fields_cache.get(model_cls)
+    if cached is None:
+        cached = {
+            name: TENSOR_TYPES[field.annotation]
+            for name, field in model_cls.model_fields.items()
+            if field.annotation in TENSOR_TYPES
+        }
+        _tensor_fields_cache[model_cls] = cached
+    return cached
+
+
+def _model_types(annotation: Any) -> list[type[BaseModel]]:
+    """获取注解中出现的所有模型类（展开 Union/list/dict 等）"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+    return [m for arg in get_args(annotation) for m in _model_types(arg)]
+
+
+def _decimals(step: float) -> int:
+    """量化步长的小数位数（取自其十进制表示），如 0.01 -> 2、0.25 -> 2、0.025 -> 3"""
+    return max(0, -Decimal(repr(float(step))).as_tuple().exponent)
+
+
+def _inf_nan_mode(model_cls: type[BaseModel]) -> str:
+    return model_cls.model_config.get("ser_json_inf_nan", "null")
+
+
+class TensorEncoder:
+    """张量字段感知的紧凑JSON编码器（以体积为目标）
+
+    识别 tensor1f/tensor2f/... 字段，将整个消息中的所有张量拼接成一个连续数组，
+    一次性按精度量化到网格后再逐个写出，几何数据较多的消息体积通常可减半。
+    其余字段（含字段序列化器、计算字段）交给模型自身的 pydantic 序列化器，
+    输出与 model_dump_json 仅在量化的张量数值上不同。
+
+    注意：量化输出需要先将张量列表转换为数组，比 model_dump_json 慢约 2~3 倍
+    （张量字段已是 numpy 数组时约 2 倍），只应在传输/存储体积比编码耗时更重要时使用；
+    未配置任何精度时 dumps_compact 直接交给 model_dump_json，耗时相同。
+
+    Args:
+        precision: 量化步长配置，键为字段名（如 "positions"）或带模型限定的字段名
+            （如 "EdgeInfo.Samples.positions"，优先于字段名）。值为正的步长，或
+            (平移步长, 旋转步长)：用于 4x4 齐次变换矩阵（如 tcp_pose、tf_a2w），
+            旋转部分和最后一行使用旋转步长，其他形状的张量使用两者中较小的步长。
+        default: 未单独配置的张量字段的量化步长，None 表示保持完整精度
+    """
+
+    def __init__(self, precision: dict[str, Step] | None = None, default: Step | None = None):
+        self.precision = dict(precision or {})
+        self.default = default
+        for name, step in [*self.precision.items(), ("default", default)]:
+            if step is not None and not _valid_step(step):
+                raise ValueError(
+                    f"Precision step for '{name}' must be a positive number or a "
+                    f"(translation, rotation) pair of positive numbers, got {step!r}"
+                )
+        self._steps_cache: dict[type[BaseModel], dict[str, Step]] = {}
+        self._walk_cache: dict[type[BaseModel], bool] = {}
+        self._plan_cache: dict[type[BaseModel], list[tuple]] = {}
+
+    def field_steps(self, model_cls: type[BaseModel]) -> dict[str, Step]:
+        """获取模型中需要量化的张量字段及其步长（按类缓存）
+
+        带有 field_serializer 的字段按其序列化器输出，不参与量化。
+        """
+        steps = self._steps_cache.get(model_cls)
+        if steps is None:
+            steps = {}
+            custom = _custom_serialized_fields(model_cls)
+            for name in tensor_fields(model_cls):
+                qualified = f"{model_cls.__qualname__}.{name}"
+                step = self.precision.get(qualified, self.precision.get(name, self.default))
+                if step is not None and name not in custom:
+                    steps[name] = step
+            self._steps_cache[model_cls] = steps
+        return steps
+
+    def _needs_walk(self, model_cls: type[BaseModel]) -> bool:
+        """模型（含嵌套子模型）中是否存在需要量化的张量字段"""
+        cached = self._walk_cache.get(model_cls)
+        if cached is None:
+            self._walk_cache[model_cls] = False  # 处理循环引用
+            cached = not model_cls.__pydantic_decorators__.model_serializers and (
+                bool(self.field_steps(model_cls))
+                or any(
+                    self._needs_walk(sub)
+                    for name, field in model_cls.model_fields.items()
+                    if name not in _custom_serialized_fields(model_cls)
+                    for sub in _model_types(field.annotation)
+                )
+            )
+            self._walk_cache[model_cls] = cached
+        return cached
+
+    def _plan(self, model_cls: type[BaseModel]) -> list[tuple]:
+        """模型的编码计划（按类缓存）
+
+        连续的普通字段合并为一段，由模型序列化器按 include 一次写出；
+        张量字段和含张量的子结构字段单独处理。每一项为：
+        ("plain", include) / ("tensor", 字段名, 键, 步长, exclude_if) / ("walk", 字段名, 键, 注解, exclude_if)
+        """
+        plan = self._plan_cache.get(model_cls)
+        if plan is None:
+            plan = []
+            steps = self.field_steps(model_cls)
+            by_alias = model_cls.model_config.get("serialize_by_alias", False)
+            run: set[str] = set()
+            for name, field in model_cls.model_fields.items():
+                if field.exclude:
+                    continue
+                walk = name not in _custom_serialized_fields(model_cls) and any(
+                    self._needs_walk(sub) for sub in _model_types(field.annotation)
+                )
+                if name not in steps and not walk:
+                    run.add(name)
+                    continue
+                if run:
+                    plan.append(("plain", run))
+                    run = set()
+                key = to_json(field.serialization_alias or name if by_alias else name)
+                exclude_if = getattr(field, "exclude_if", None)
+                if name in steps:
+                    plan.append(("tensor", name, key, steps[name], exclude_if))
+                else:
+                    plan.append(("walk", name, key, field.annotation, exclude_if))
+            run |= set(model_cls.model_computed_fields)
+            if run:
+                plan.append(("plain", run))
+            self._plan_cache[model_cls] = plan
+        return plan
+
+    def dumps_compact(self, model: BaseModel) -> str:
+        """将模型编码为张量量化后的紧凑JSON字符串"""
+        parts: list[bytes | int] = []
+        tensors: list[tuple[np.ndarray, Step, str]] = []
+        self._encode_model(model, type(model), parts, tensors)
+        blobs = _format_tensors(tensors)
+        return b"".join(blobs[p] if isinstance(p, int) else p for p in parts).decode("utf-8")
+
+    def _encode_model(
+        self, model: BaseModel, model_cls: type[BaseModel], parts: list, tensors: list
+    ):
+        """按 model_cls（字段声明的类型）编码模型，与 pydantic 不按子类字段输出的行为一致"""
+        serializer = model_cls.__pydantic_serializer__
+        if not self._needs_walk(model_cls):
+            parts.append(serializer.to_json(model))
+            return
+
+        mode = _inf_nan_mode(model_cls)
+        first = True
+        parts.append(b"{")
+        for entry in self._plan(model_cls):
+            if entry[0] == "plain":
+                blob = serializer.to_json(model, include=entry[1])[1:-1]
+                if blob:
+                    parts.append(blob if first else b"," + blob)
+                    first = False
+                continue
+            _, name, key, arg, exclude_if = entry
+            value = getattr(model, name)
+            if exclude_if is not None and exclude_if(value):
+                continue
+            parts.append(key + b":" if first else b"," + key + b":")
+            first = False
+            if entry[0] == "tensor":
+                self._encode_tensor(value, arg, mode, parts, tensors)
+            else:
+                self._encode(value, arg, mode, parts, tensors)
+        parts.append(b"}")
+
+    def _encode(self, value: Any, annotation: Any, mode: str, parts: list, tensors: list):
+        """按字段注解编码含张量子模型的值，不含子模型的部分交给 pydantic 按注解序列化"""
+        annotation = _union_member(annotation, value)
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+        if isinstance(value, BaseModel):
+            declared = annotation if isinstance(annotation, type) else type(value)
+            self._encode_model(value, declared, parts, tensors)
+        elif isinstance(value, dict) and origin is dict and len(args) == 2:
+            parts.append(b"{")
+            for i, (k, v) in enumerate(value.items()):
+                parts.append((b"," if i else b"") + to_json(str(k)) + b":")
+                self._encode(v, args[1], mode, parts, tensors)
+            parts.append(b"}")
+        elif isinstance(value, (list, tuple, deque)) and origin in (list, tuple, deque) and args:
+            parts.append(b"[")
+            for i, v in enumerate(value):
+                if i:
+                    parts.append(b",")
+                self._encode(v, args[0], mode, parts, tensors)
+            parts.append(b"]")
+        else:
+            parts.append(_adapter(annotation, mode).dump_json(value))
+
+    def _encode_tensor(self, value: Any, step: Step, mode: str, parts: list, tensors: list):
+        """张量登记到批量格式化队列，参差张量直接量化后逐层编码"""
+        if isinstance(value, np.ndarray):
+            array = value.astype(np.float64, copy=False)
+        elif len(value) == 0:
+            parts.append(b"[]")
+            return
+        else:
+            try:
+                array = np.asarray(value, dtype=np.float64)
+            except ValueError:
+                parts.append(to_json(_quantize_ragged(value, step), inf_nan_mode=mode))
+                return
+        parts.append(len(tensors))
+        tensors.append((array, step, mode))
+
+    def encode_tensor(self, value: Any, step: Step | None) -> bytes:
+        """单独编码一个张量（step 为 None 时保持完整精度）"""
+        if step is None:
+            if isinstance(value, np.ndarray):
+                value = value.tolist()
+            return to_json(value, inf_nan_mode="null")
+        if not _valid_step(step):
+            raise ValueError(f"Invalid precision step {step!r}")
+        parts: list[bytes | int] = []
+        tensors: list[tuple[np.ndarray, Step, str]] = []
+        self._encode_tensor(value, step, "null", parts, tensors)
+        blobs = _format_tensors(tensors)
+        return b"".join(blobs[p] if isinstance(p, int) else p for p in parts)
+
+    def loads_arrays(self, model_cls: type[BaseModel], data: str | bytes) -> dict[str, Any]:
+        """解析JSON为字典，张量字段直接构建为 numpy 数组（float64）
+
+        便于直接对几何数据做数组运算；按模型结构预先编译字段转换计划，不做 pydantic 校验，
+        耗时与 model_validate_json 相当。需要模型实例时直接使用 model_cls.model_validate_json。
+        """
+        data = from_json(data)
+        _apply_plan(model_cls, data)
+        return data
+
+
+def _valid_step(step: Any) -> bool:
+    """步长必须为正数，或两个正数组成的 (平移, 旋转) 元组"""
+    if isinstance(step, tuple):
+        return len(step) == 2 and all(_valid_step(s) for s in step)
+    return isinstance(step, (int, float)) and not isinstance(step, bool) and step > 0
+
+
+def _custom_serialized_fields(model_cls: type[BaseModel]) -> set[str]:
+    """带有 field_serializer 的字段名"""
+    return {
+        name
+        for decorator in model_cls.__pydantic_decorators__.field_serializers.values()
+        for name in decorator.info.fields
+    }
+
+
+def _union_member(annotation: Any, value: Any) -> Any:
+    """从 Union 注解中选出与值匹配的成员类型，无法确定时返回原注解"""
+    if get_origin(annotation) not in (Union, types.UnionType):
+        return annotation
+    members = get_args(annotation)
+    if isinstance(value, BaseModel):
+        matches = [m for m in members if isinstance(m, type) and isinstance(value, m)]
+        # 优先精确类型，其次最具体的父类
+        return max(matches, key=lambda m: (m is type(value), len(m.__mro__)), default=annotation)
+    for member in members:
+        origin = get_origin(member)
+        if origin is not None and isinstance(origin, type) and isinstance(value, origin):
+            return member
+    return annotation
+
+
+# (注解, inf_nan_mode) -> TypeAdapter 缓存
+_adapter_cache: dict[tuple[Any, str], TypeAdapter] = {}
+
+
+def _adapter(annotation: Any, mode: str) -> TypeAdapter:
+    adapter = _adapter_cache.get((annotation, mode))
+    if adapter is None:
+        try:
+            adapter = TypeAdapter(annotation, config=ConfigDict(ser_json_inf_nan=mode))
+        except PydanticUserError:
+            adapter = TypeAdapter(annotation)  # 模型等自带配置的类型
+        _adapter_cache[(annotation, mode)] = adapter
+    return adapter
+
+
+def _quantize_ragged(value: Any, step: Step) -> Any:
+    """参差张量逐层量化"""
+    if isinstance(value, (list, tuple)):
+        return [_quantize_ragged(v, step) for v in value]
+    s = min(step) if isinstance(step, tuple) else step
+    return round(round(value / s) * s, _decimals(s)) if np.isfinite(value) else value
+
+
+def _element_steps(array: np.ndarray, step: Step) -> np.ndarray | float:
+    """每个元素的量化步长；(平移, 旋转) 步长只对 4x4 矩阵拆分"""
+    if not isinstance(step, tuple):
+        return step
+    translation, rotation = step
+    if array.ndim < 2 or array.shape[-2:] != (4, 4):
+        return min(translation, rotation)
+    steps = np.full(array.shape, float(rotation))
+    steps[..., :3, 3] = translation
+    return steps
+
+
+def _step_decimals(step: Step) -> int:
+    return max(_decimals(s) for s in step) if isinstance(step, tuple) else _decimals(step)
+
+
+def _format_tensors(tensors: list[tuple[np.ndarray, Step, str]]) -> list[bytes]:
+    """将所有张量拼接为一个连续数组，一次性量化到网格后逐个写出JSON
+
+    量化后的值按步长的小数位数取整，其最短表示即为目标精度，
+    由 pydantic_core 的浮点输出（最短往返表示）直接写出。
+    """
+    if not tensors:
+        return []
+    arrays = [array for array, _, _ in tensors]
+    specs = [step for _, step, _ in tensors]
+    sizes = [array.size for array in arrays]
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+    flat = np.concatenate([array.ravel() for array in arrays])
+
+    steps = np.repeat([min(s) if isinstance(s, tuple) else s for s in specs], sizes)
+    decimals = [_step_decimals(s) for s in specs]
+    for j, (array, spec) in enumerate(zip(arrays, specs, strict=True)):
+        if isinstance(spec, tuple):
+            steps[offsets[j] : offsets[j + 1]] = np.broadcast_to(
+                _element_steps(array, spec), array.shape
+            ).ravel()
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        grid = np.round(flat / steps) * steps
+    # 去掉网格乘法引入的浮点误差（如 0.15000000000000002），不同小数位数分组处理
+    distinct = set(decimals)
+    if len(distinct) == 1:
+        grid = np.round(grid, distinct.pop())
+    else:
+        per_element = np.repeat(decimals, sizes)
+        for value in distinct:
+            mask = per_element == value
+            grid[mask] = np.round(grid[mask], value)
+
+    return [
+        to_json(grid[offsets[j] : offsets[j + 1]].reshape(array.shape).tolist(), inf_nan_mode=mode)
+        for j, (array, _, mode) in enumerate(tensors)
+    ]
+
+
+def _as_array(value: Any) -> Any:
+    try:
+        return np.asarray(value, dtype=np.float64)
+    except (ValueError, TypeError):
+        return value  # 参差张量保持列表
+
+
+# 模型类 -> [(字段名, 是否张量, 子结构转换函数)]
+_plan_cache: dict[type[BaseModel], list[tuple[str, bool, Callable[[Any], None] | None]]] = {}
+
+
+def _apply_plan(model_cls: type[BaseModel], data: Any):
+    """按模型结构将字典中的张量字段替换为数组，并递归处理子模型"""
+    if not isinstance(data, dict):
+        return
+    plan = _plan_cache.get(model_cls)
+    if plan is None:
+        _plan_cache[model_cls] = []  # 处理循环引用
+        tensors = tensor_fields(model_cls)
+        plan = [
+            (name, name in tensors, None if name in tensors else _converter(field.annotation))
+            for name, field in model_cls.model_fields.items()
+        ]
+        plan = [entry for entry in plan if entry[1] or entry[2] is not None]
+        _plan_cache[model_cls] = plan
+    for name, is_tensor, convert in plan:
+        if name not in data:
+            continue
+        if is_tensor:
+            data[name] = _as_array(data[name])
+        else:
+            convert(data[name])
+
+
+def _converter(annotation: Any) -> Callable[[Any], None] | None:
+    """根据字段注解生成子结构的转换函数，不含子模型时返回 None"""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: _apply_plan(annotation, value)
+    if origin in (Union, types.UnionType):
+        # 取第一个非 None 的候选类型（如 list[RobotFrame] | deque[RobotFrame] 只需处理一次）
+        arg = next((a for a in args if a is not type(None)), None)
+        return _converter(arg)
+    if origin in (list, deque) and args:
+        item = _converter(args[0])
+        if item is None:
+            return None
+
+        def convert_list(value: Any):
+            if isinstance(value, list):
+                for v in value:
+                    item(v)
+
+        return convert_list
+    if origin is dict and len(args) == 2:
+        item = _converter(args[1])
+        if item is None:
+            return None
+
+        def convert_dict(value: Any):
+            if isinstance(value, dict):
+                for v in value.values():
+                    item(v)
+
+        return convert_dict
+    return None
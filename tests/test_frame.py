@@ -0,0 +1,78 @@
+"""RobotFrameSequence 环形缓冲模式测试"""
+
+import pytest
+
+from data_model import JsonlFrameSpill, RobotFrame, RobotFrameSequence
+
+
+def _fill(sequence: RobotFrameSequence, count: int):
+    for i in range(count):
+        sequence.add_frame(RobotFrame(seq=0, timestamp=float(i)))
+
+
+def test_unbounded_sequence_unchanged():
+    sequence = RobotFrameSequence()
+    _fill(sequence, 5)
+    assert isinstance(sequence.frames, list)
+    assert [f.seq for f in sequence.frames] == [0, 1, 2, 3, 4]
+    # 非环形模式下 seq 无需有序
+    sequence.add_frame(RobotFrame(seq=2))
+    assert sequence.get_frame_by_seq(2) is sequence.frames[2]
+
+
+def test_ring_wraparound():
+    sequence = RobotFrameSequence(capacity=3)
+    _fill(sequence, 7)
+    assert [f.seq for f in sequence.frames] == [4, 5, 6]
+    assert sequence.get_frame_by_seq(5).timestamp == 5.0
+    assert sequence.get_frame_by_seq(3) is None
+    assert [f.seq for f in sequence.get_frames_since(5.0)] == [5, 6]
+
+
+def test_ring_lookup_with_gaps():
+    sequence = RobotFrameSequence(capacity=4)
+    for seq in (3, 5, 9, 10):
+        sequence.add_frame(RobotFrame(seq=seq))
+    assert sequence.get_frame_by_seq(9).seq == 9
+    assert sequence.get_frame_by_seq(4) is None
+
+
+def test_ring_rejects_non_increasing_seq():
+    sequence = RobotFrameSequence(capacity=3)
+    sequence.add_frame(RobotFrame(seq=5))
+    with pytest.raises(ValueError, match="strictly increasing"):
+        sequence.add_frame(RobotFrame(seq=3))
+    with pytest.raises(ValueError, match="strictly increasing"):
+        sequence.add_frame(RobotFrame(seq=5))
+    assert [f.seq for f in sequence.frames] == [5]
+
+    with pytest.raises(ValueError, match="strictly increasing"):
+        RobotFrameSequence(capacity=3, frames=[RobotFrame(seq=2), RobotFrame(seq=1)])
+
+
+def test_ring_spill(tmp_path):
+    spill = JsonlFrameSpill(tmp_path / "spill.jsonl")
+    sequence = RobotFrameSequence(capacity=2)
+    sequence.set_spill(spill)
+    _fill(sequence, 5)
+    assert [f.seq for f in spill.load()] == [0, 1, 2]
+    assert [f.seq for f in sequence.frames] == [3, 4]
+
+
+def test_ring_reload_continues_seq():
+    sequence = RobotFrameSequence(capacity=3)
+    _fill(sequence, 5)
+    reloaded = RobotFrameSequence.model_validate_json(sequence.model_dump_json())
+    assert [f.seq for f in reloaded.frames] == [2, 3, 4]
+
+    _fill(reloaded, 2)
+    assert [f.seq for f in reloaded.frames] == [4, 5, 6]
+    assert reloaded.get_frame_by_seq(6) is reloaded.frames[-1]
+
+
+def test_ring_trims_initial_frames():
+    frames = [RobotFrame(seq=i) for i in range(5)]
+    sequence = RobotFrameSequence(capacity=2, frames=frames)
+    assert [f.seq for f in sequence.frames] == [3, 4]
+    with pytest.raises(ValueError):
+        RobotFrameSequence(capacity=0)
@@ -0,0 +1,130 @@
+"""SceneBatch 批量求值测试"""
+
+import numpy as np
+import pytest
+
+from data_model import (
+    ObjectInfo,
+    RobotInfo,
+    RobotScene,
+    SceneBatch,
+    Transform,
+    TransformOnFrame,
+    quaternions_to_matrices,
+)
+
+
+def _pose(translation, rotation, frame_id="world") -> TransformOnFrame:
+    return TransformOnFrame(
+        transform=Transform(translation=translation, rotation=rotation), frame_id=frame_id
+    )
+
+
+def _random_pose(rng: np.random.Generator) -> list[float]:
+    quat = rng.normal(size=4)
+    return rng.uniform(-1, 1, size=3).tolist() + (quat / np.linalg.norm(quat)).tolist()
+
+
+@pytest.fixture
+def scene() -> RobotScene:
+    robot = RobotInfo(
+        name="robot_1",
+        pose=_pose([1.0, 0.0, 0.5], [0.0, 0.0, 0.7071068, 0.7071068]),
+        frames={"tool0": _pose([0.0, 0.0, 0.3], [0.0, 0.3826834, 0.0, 0.9238795], "robot_1")},
+    )
+    table = ObjectInfo(name="table", pose=_pose([0.0, 2.0, 0.0], [0.0, 0.0, 0.0, 1.0]))
+    part = ObjectInfo(
+        name="part",
+        pose=_pose([0.1, 0.0, 0.05], [0.5, 0.5, 0.5, 0.5], "robot_1/tool0"),
+        frames={"grip": _pose([0.0, 0.02, 0.0], [0.0, 0.0, 0.0, 1.0], "part")},
+    )
+    return RobotScene(robots={"robot_1": robot}, objects={"table": table, "part": part})
+
+
+def _reference_world(scene: RobotScene, name: str) -> np.ndarray:
+    """逐个坐标系沿 frame_id 链相乘 Transform.to_matrix 得到世界位姿"""
+    objects = {**scene.robots, **scene.objects}
+    obj_name, _, sub = name.partition("/")
+    pose = objects[obj_name].frames[sub] if sub else objects[obj_name].pose
+    local = np.array(pose.transform.to_matrix())
+    if pose.frame_id in ("", scene.world_frame):
+        return local
+    return _reference_world(scene, pose.frame_id) @ local
+
+
+def test_quaternions_to_matrices_matches_transform():
+    rng = np.random.default_rng(0)
+    poses = np.array([_random_pose(rng) for _ in range(10)])
+    expected = [Transform(translation=list(p[:3]), rotation=list(p[3:])).to_matrix() for p in poses]
+    np.testing.assert_allclose(quaternions_to_matrices(poses), expected, atol=1e-12)
+
+
+def test_quaternions_to_matrices_degenerate_rotation():
+    matrix = quaternions_to_matrices(np.array([1.0, 2.0, 3.0, 0.0, 0.0, 0.0, 0.0]))
+    expected = np.eye(4)
+    expected[:3, 3] = [1.0, 2.0, 3.0]
+    np.testing.assert_allclose(matrix, expected)
+
+
+def test_evaluate_template_matches_transform_chain(scene):
+    batch = SceneBatch(scene)
+    assert batch.frame_names == ["robot_1", "robot_1/tool0", "table", "part", "part/grip"]
+
+    world = batch.evaluate(batch.template_poses()[None])
+    assert world.shape == (1, batch.num_frames, 4, 4)
+    for i, name in enumerate(batch.frame_names):
+        np.testing.assert_allclose(world[0, i], _reference_world(scene, name), atol=1e-12)
+
+
+def test_evaluate_overrides_match_per_scene_chain(scene):
+    batch = SceneBatch(scene, override_names=["robot_1", "part"])
+    rng = np.random.default_rng(1)
+    poses = np.array([[_random_pose(rng) for _ in range(2)] for _ in range(5)])
+    world = batch.evaluate(poses)
+
+    for s in range(len(poses)):
+        candidate = scene.model_copy(deep=True)
+        for k, name in enumerate(batch.override_names):
+            obj = candidate.robots.get(name) or candidate.objects[name]
+            obj.pose.transform = Transform(
+                translation=poses[s, k, :3].tolist(), rotation=poses[s, k, 3:].tolist()
+            )
+        for i, name in enumerate(batch.frame_names):
+            np.testing.assert_allclose(world[s, i], _reference_world(candidate, name), atol=1e-12)
+
+
+def test_get_transform(scene):
+    batch = SceneBatch(scene)
+    world = batch.evaluate(np.stack([batch.template_poses()] * 2))
+    tool_to_table = batch.get_transform(world, "part/grip", "table")
+    expected = np.linalg.inv(_reference_world(scene, "table")) @ _reference_world(
+        scene, "part/grip"
+    )
+    np.testing.assert_allclose(tool_to_table, [expected, expected], atol=1e-12)
+    np.testing.assert_allclose(batch.get_transform(world, "table", "world")[0], world[0, 2])
+
+
+def test_evaluate_rejects_wrong_shape(scene):
+    batch = SceneBatch(scene)
+    with pytest.raises(ValueError):
+        batch.evaluate(np.zeros((2, batch.num_overrides + 1, 7)))
+
+
+def test_invalid_frame_trees(scene):
+    scene.objects["table"].pose.frame_id = "missing"
+    with pytest.raises(ValueError, match="unknown frame"):
+        SceneBatch(scene)
+
+    scene.objects["table"].pose.frame_id = "part/grip"
+    scene.objects["part"].pose.frame_id = "table"
+    with pytest.raises(ValueError, match="Cyclic"):
+        SceneBatch(scene)
+
+
+def test_duplicate_frame_name():
+    scene = RobotScene(
+        robots={"robot_1": RobotInfo(name="robot_1", frames={"tool0": TransformOnFrame()})},
+        objects={"robot_1/tool0": ObjectInfo(name="robot_1/tool0")},
+    )
+    with pytest.raises(ValueError, match="Duplicate frame name"):
+        SceneBatch(scene)
@@ -0,0 +1,122 @@
+"""SceneStore / SceneCache 测试"""
+
+import pytest
+
+from data_model import (
+    DataBag,
+    RobotFrame,
+    RobotFrameSequence,
+    RobotInfo,
+    RobotScene,
+    SceneCache,
+    SceneStore,
+    scene_hash,
+)
+from data_model.scene_store import estimate_scene_bytes
+
+
+def _scene(updated_at: str = "2025-01-01T00:00:00", name: str = "cell") -> RobotScene:
+    return RobotScene(
+        scene_id="cell_1",
+        scene_name=name,
+        robots={"robot_1": RobotInfo(name="robot_1")},
+        updated_at=updated_at,
+    )
+
+
+def _bag(scene: RobotScene, seq: int = 0) -> DataBag:
+    frames = RobotFrameSequence(scene_id=scene.scene_id)
+    frames.add_frame(RobotFrame(seq=seq, timestamp=float(seq)))
+    return DataBag(scene=scene, frames=frames)
+
+
+@pytest.fixture
+def store(tmp_path) -> SceneStore:
+    return SceneStore(tmp_path, cache=SceneCache())
+
+
+def test_scene_hash_is_content_based():
+    assert scene_hash(_scene()) == scene_hash(_scene().model_dump())
+    assert scene_hash(_scene()) != scene_hash(_scene(name="other"))
+
+
+def test_bag_round_trip_shares_scene(store):
+    scene = _scene()
+    dumped = [store.dump_bag_json(_bag(scene, seq)) for seq in range(3)]
+    assert len(list(store.root.glob("*.json"))) == 1
+    assert '"robots"' not in dumped[0]
+
+    bags = [store.load_bag(data) for data in dumped]
+    assert bags[0].scene == scene
+    assert bags[1].frames.frames[0].seq == 1
+    # 缓存命中时所有数据包共享同一个场景实例
+    assert bags[0].scene is bags[1].scene is bags[2].scene
+
+
+def test_put_caches_independent_instance(store):
+    scene = _scene()
+    key = store.put(scene)
+    scene.scene_name = "MUTATED"
+    assert store.get(key).scene_name == "cell"
+
+
+def test_load_bag_with_embedded_scene(store):
+    bag = _bag(_scene())
+    assert store.load_bag(bag.model_dump_json()) == bag
+
+
+def test_use_latest(store):
+    old, new = _scene("2025-01-01T00:00:00"), _scene("2025-06-01T00:00:00", name="new")
+    data = store.dump_bag(_bag(old))
+    store.put(new)
+
+    assert store.load_bag(data).scene.scene_name == "cell"
+    assert store.load_bag(data, use_latest=True).scene.scene_name == "new"
+    assert store.latest("cell_1") == scene_hash(new)
+
+
+def test_index_rebuilt_from_disk(store):
+    store.put(_scene("2025-01-01T00:00:00"))
+    key = store.put(_scene("2025-06-01T00:00:00", name="new"))
+    # 缺少元数据的场景在重建索引时补写
+    store._meta_path(key).unlink()
+
+    reopened = SceneStore(store.root, cache=SceneCache())
+    assert reopened.latest("cell_1") == key
+    assert store._meta_path(key).exists()
+    assert reopened.get(key).scene_name == "new"
+
+
+def test_get_errors(store):
+    key = store.put(_scene())
+    with pytest.raises(ValueError):
+        store.get(key, scene_id="other")
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+    data = store.dump_bag(_bag(_scene()))
+    data["frames"]["scene_id"] = "other"
+    with pytest.raises(ValueError):
+        store.load_bag(data)
+
+
+def test_cache_lru_eviction():
+    cache = SceneCache(max_bytes=100)
+    scenes = {key: _scene(name=key) for key in "abc"}
+    cache.put("a", scenes["a"], 40)
+    cache.put("b", scenes["b"], 40)
+    assert cache.get("a") is scenes["a"]  # a 变为最近使用
+    cache.put("c", scenes["c"], 40)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.size == 80
+
+    cache.put("huge", scenes["a"], 101)
+    assert "huge" not in cache and len(cache) == 2
+
+
+def test_cache_accounts_object_size(store):
+    key = store.put(_scene())
+    blob = store._path(key).read_bytes()
+    assert store.cache.size == estimate_scene_bytes(blob) > len(blob)
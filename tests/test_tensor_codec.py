@@ -0,0 +1,156 @@
+"""TensorEncoder 测试"""
+
+import json
+import math
+
+import numpy as np
+import pytest
+from pydantic import BaseModel, computed_field, field_serializer
+
+from data_model import EdgeInfo, RobotState, SeamInfo, StpInfo, TensorEncoder, tensor_fields
+from data_model.types import tensor1f, tensor2f
+
+
+def _seam() -> SeamInfo:
+    rng = np.random.default_rng(0)
+    samples = EdgeInfo.Samples(
+        positions=(rng.random((5, 3)) * 100).tolist(),
+        tangents=rng.random((5, 3)).tolist(),
+        rays=[],
+    )
+    return SeamInfo(edges=[EdgeInfo(group=1, samples=samples)], stp_key="a")
+
+
+def test_tensor_fields():
+    assert tensor_fields(StpInfo) == {"aabb": 1, "obb": 2, "tf_a2w": 2}
+
+
+def test_without_precision_matches_model_dump_json():
+    seam = _seam()
+    assert TensorEncoder().dumps_compact(seam) == seam.model_dump_json()
+
+
+@pytest.mark.parametrize("step", [0.25, 0.025, 0.01, 1e-6])
+def test_values_on_grid_are_unchanged(step):
+    values = [k * step for k in range(-20, 20)]
+    stp = StpInfo(aabb=values)
+    out = json.loads(TensorEncoder(default=step).dumps_compact(stp))
+    assert out["aabb"] == [round(v, 9) for v in values]
+
+
+def test_quantizes_to_grid():
+    stp = StpInfo(aabb=[0.26, 0.1374, -0.88, 3.0])
+    out = json.loads(TensorEncoder({"aabb": 0.25}).dumps_compact(stp))
+    assert out["aabb"] == [0.25, 0.25, -1.0, 3.0]
+    out = json.loads(TensorEncoder({"aabb": 0.025}).dumps_compact(stp))
+    assert out["aabb"] == [0.25, 0.125, -0.875, 3.0]
+
+
+def test_split_steps_for_4x4():
+    tf = np.eye(4)
+    tf[:3, :3] = [[0.1234567, 0.0, 0.0], [0.0, 0.7654321, 0.0], [0.0, 0.0, 1.0]]
+    tf[:3, 3] = [1.23456, -2.34567, 3.45678]
+    stp = StpInfo(tf_a2w=tf.tolist(), aabb=[1.23456, 0.1234567])
+    out = json.loads(TensorEncoder(default=(0.01, 1e-4)).dumps_compact(stp))
+
+    assert [row[3] for row in out["tf_a2w"][:3]] == [1.23, -2.35, 3.46]
+    assert out["tf_a2w"][0][0] == 0.1235 and out["tf_a2w"][1][1] == 0.7654
+    assert out["tf_a2w"][3] == [0.0, 0.0, 0.0, 1.0]
+    # 非 4x4 张量使用较小的步长
+    assert out["aabb"] == [1.2346, 0.1235]
+
+
+def test_nan_and_inf_follow_model_dump_json():
+    stp = StpInfo(aabb=[math.nan, math.inf, 0.123], obb=[[1.0, math.nan]])
+    out = TensorEncoder(default=0.1).dumps_compact(stp)
+    assert json.loads(out)["aabb"] == [None, None, 0.1]
+    assert json.loads(out)["obb"] == [[1.0, None]]
+    assert json.loads(stp.model_dump_json())["aabb"][:2] == [None, None]
+
+
+def test_non_tensor_fields_use_model_serializer():
+    stp = StpInfo(volume=0, aabb=[0.5, 1.5], tf_a2w=np.eye(4).tolist(), nb_face=3)
+    # 张量已在网格上时输出与 model_dump_json 完全一致
+    assert TensorEncoder(default=0.5).dumps_compact(stp) == stp.model_dump_json()
+
+    seam = SeamInfo(edges=[EdgeInfo(length=0, samples=EdgeInfo.Samples(positions=[[0.5]]))])
+    assert TensorEncoder({"positions": 0.5}).dumps_compact(seam) == seam.model_dump_json()
+
+
+class _Part(BaseModel):
+    points: tensor2f = []
+    label: str = ""
+
+    @field_serializer("label")
+    def _upper(self, value: str) -> str:
+        return value.upper()
+
+    @computed_field
+    @property
+    def count(self) -> int:
+        return len(self.points)
+
+
+class _TaggedPart(_Part):
+    tag: str = "extra"
+
+
+class _Assembly(BaseModel):
+    parts: dict[str, _Part] = {}
+    main: _Part | None = None
+    weights: tensor1f = []
+
+    @field_serializer("weights")
+    def _sum(self, value: list[float]) -> float:
+        return sum(value)
+
+
+def test_serializers_and_declared_types():
+    assembly = _Assembly(
+        parts={"a": _TaggedPart(points=[[0.123, 4.56]], label="x")},
+        main=None,
+        weights=[0.1234, 0.2],
+    )
+    out = TensorEncoder(default=0.1).dumps_compact(assembly)
+    expected = json.loads(assembly.model_dump_json())
+    expected["parts"]["a"]["points"] = [[0.1, 4.6]]
+    assert json.loads(out) == expected
+    # 子类实例按声明类型输出，与 model_dump_json 一致
+    assert "tag" not in json.loads(out)["parts"]["a"]
+    # field_serializer 字段不参与量化
+    assert json.loads(out)["weights"] == pytest.approx(0.3234)
+
+
+def test_ndarray_backed_fields():
+    state = RobotState.model_construct(robot_id="r", tcp_pose=np.eye(4) * 0.333333)
+    out = json.loads(TensorEncoder({"tcp_pose": 0.01}).dumps_compact(state))
+    assert out["tcp_pose"][0] == [0.33, 0.0, 0.0, 0.0]
+
+
+def test_ragged_tensor():
+    seam = SeamInfo(edges=[EdgeInfo(samples=EdgeInfo.Samples(positions=[[0.126], [0.1, 0.26]]))])
+    out = json.loads(TensorEncoder({"positions": 0.1}).dumps_compact(seam))
+    assert out["edges"][0]["samples"]["positions"] == [[0.1], [0.1, 0.3]]
+
+
+@pytest.mark.parametrize("step", [0, -0.1, (0.1,), (0.1, 0.2, 0.3), (0.1, 0), "0.1", True])
+def test_invalid_steps(step):
+    with pytest.raises(ValueError):
+        TensorEncoder(default=step)
+    with pytest.raises(ValueError):
+        TensorEncoder({"aabb": step})
+
+
+def test_qualified_precision_key():
+    encoder = TensorEncoder({"EdgeInfo.Samples.positions": 0.1, "positions": 1.0})
+    assert encoder.field_steps(EdgeInfo.Samples) == {"positions": 0.1}
+
+
+def test_loads_arrays_round_trip():
+    seam = _seam()
+    encoder = TensorEncoder({"positions": 0.001})
+    data = encoder.loads_arrays(SeamInfo, encoder.dumps_compact(seam))
+    positions = data["edges"][0]["samples"]["positions"]
+    assert isinstance(positions, np.ndarray) and positions.shape == (5, 3)
+    np.testing.assert_allclose(positions, seam.edges[0].samples.positions, atol=5e-4)
+    assert data["stp_key"] == "a"